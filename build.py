@@ -7,46 +7,157 @@ Structure:
 - Output: assets/data/ (consolidated people.json, edges.json, organizations.json, documents.json, cases.json)
 """
 
+import copy
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional, Union
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+if msgspec is not None:
+    # Typed schema for the consolidated edges file (see merge_edges). The other
+    # outputs carry free-form per-document fields and stay schema-less.
+    class EdgeRecord(msgspec.Struct):
+        edge_id: str
+        relationship: str
+        weight: Union[int, float]
+
+    class Edge(msgspec.Struct):
+        source: Optional[str]
+        target: Optional[str]
+        edges: List[EdgeRecord]
+        avg_weight: float
 
 def load_json(filepath: str) -> Any:
     """Load JSON file, return empty dict/list if not found."""
     if not os.path.exists(filepath):
         return [] if filepath.endswith('.json') else {}
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def save_json(filepath: str, data: Any) -> None:
-    """Save data to JSON file with nice formatting."""
+def save_json(filepath: str, data: Any, schema: Any = None) -> None:
+    """
+    Save data to JSON file with nice formatting. If a msgspec schema type is
+    given (and msgspec is installed), data is validated against it and written
+    with msgspec's type-specialized encoder.
+    """
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if schema is not None and msgspec is not None:
+        encoded = msgspec.json.encode(msgspec.convert(data, schema))
+        with open(filepath, 'wb') as f:
+            f.write(msgspec.json.format(encoded, indent=2))
+    elif orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
     print(f"Saved {filepath}")
 
+def iter_json_items(filepath: str, keys: List[str]) -> Iterator[Any]:
+    """
+    Yield the records of a JSON file that is either a list or a dict holding
+    the list under the first present key of keys. Streams with ijson when
+    available so the whole file is never loaded at once.
+    """
+    if not os.path.exists(filepath):
+        return
+    
+    if ijson is None:
+        data = load_json(filepath)
+        if isinstance(data, list):
+            yield from data
+        elif isinstance(data, dict):
+            for key in keys:
+                if key in data:
+                    yield from data[key]
+                    return
+        return
+    
+    with open(filepath, 'rb') as f:
+        # the first parse event tells a list from a dict
+        events = ijson.parse(f, use_float=True)
+        _, event, _ = next(events, (None, None, None))
+        if event == 'start_array':
+            f.seek(0)
+            yield from ijson.items(f, 'item', use_float=True)
+            return
+        if event != 'start_map':
+            return
+        
+        # Like the load_json path, use the first of keys present at the top
+        # level even if its list is empty; keys[0] wins as soon as it is seen
+        present = set()
+        for prefix, event, value in events:
+            if prefix == '' and event == 'map_key':
+                present.add(value)
+                if value == keys[0]:
+                    break
+        key = next((k for k in keys if k in present), None)
+        if key is None:
+            return
+        f.seek(0)
+        yield from ijson.items(f, f'{key}.item', use_float=True)
+
 def merge_documents(docs_list: List[Dict]) -> List[Dict]:
     """Merge documents, keeping unique by ID."""
     seen = {}
     for doc in docs_list:
-        if doc.get('id') not in seen:
-            seen[doc['id']] = doc
+        seen.setdefault(doc['id'], doc)
     return list(seen.values())
 
+def _append_unique(target: List, items: List, seen_items: set) -> None:
+    """Append items missing from target; seen_items indexes its hashable entries."""
+    for item in items:
+        try:
+            if item in seen_items:
+                continue
+            seen_items.add(item)
+        except TypeError:
+            # Item is unhashable (dict/list), just add if not present
+            if item in target:
+                continue
+        target.append(item)
+
 def merge_people(people_list: List[Dict]) -> List[Dict]:
     """Merge people, keeping unique by ID and merging their properties."""
     seen = {}
+    # Per person and list field: set of hashable items already in that list
+    seen_hashables = {}
     
     for person in people_list:
         pid = person.get('id')
         
         if pid not in seen:
             # First occurrence: deep copy to avoid mutations
-            seen[pid] = json.loads(json.dumps(person))
+            seen[pid] = copy.deepcopy(person)
+            seen_hashables[pid] = {}
         else:
             # Merge with existing person
             existing = seen[pid]
+            hashables = seen_hashables[pid]
             
             for key, value in person.items():
                 if key == 'id':
@@ -58,23 +169,15 @@ def merge_people(people_list: List[Dict]) -> List[Dict]:
                 else:
                     existing_val = existing[key]
                     
-                    # Merge lists: combine and deduplicate
+                    # Merge lists: combine and deduplicate, preserving order
                     if isinstance(value, list) and isinstance(existing_val, list):
-                        combined = existing_val + value
-                        # Deduplicate while preserving order
-                        seen_items = set()
-                        deduped = []
-                        for item in combined:
-                            # Handle both hashable and unhashable items
-                            try:
-                                if item not in seen_items:
-                                    seen_items.add(item)
-                                    deduped.append(item)
-                            except TypeError:
-                                # Item is unhashable (dict/list), just add if not present
-                                if item not in deduped:
-                                    deduped.append(item)
-                        existing[key] = deduped
+                        if key not in hashables:
+                            # First merge into this list: dedupe and index it once
+                            hashables[key] = set()
+                            deduped = []
+                            _append_unique(deduped, existing_val, hashables[key])
+                            existing[key] = existing_val = deduped
+                        _append_unique(existing_val, value, hashables[key])
                     
                     # Merge dicts: recursively merge
                     elif isinstance(value, dict) and isinstance(existing_val, dict):
@@ -94,6 +197,39 @@ def merge_edges(edges_list: List[Dict]) -> List[Dict]:
     Combines edge_ids, relationships, and weights into lists.
     Calculates average weight for the edge.
     """
+    if pd is None or not edges_list:
+        return _merge_edges_python(edges_list)
+    
+    # pandas only numbers the groups; keys, records and averages come from the
+    # input dicts so missing values stay None and weights keep their int/float type
+    df = pd.DataFrame(edges_list, columns=['source', 'target'])
+    
+    # Groups numbered in first-appearance order, matching the dict-based version
+    group_codes = df.groupby(['source', 'target'], sort=False, dropna=False).ngroup().tolist()
+    
+    result = []
+    for code, edge in zip(group_codes, edges_list):
+        if code == len(result):
+            result.append({
+                'source': edge.get('source'),
+                'target': edge.get('target'),
+                'edges': [],
+                'avg_weight': 0
+            })
+        result[code]['edges'].append({
+            'edge_id': edge.get('edge_id', ''),
+            'relationship': edge.get('relationship', 'unknown'),
+            'weight': edge.get('weight', 1)
+        })
+    
+    for merged in result:
+        weights = [e['weight'] for e in merged['edges']]
+        merged['avg_weight'] = round(sum(weights) / len(weights), 2)
+    
+    return result
+
+def _merge_edges_python(edges_list: List[Dict]) -> List[Dict]:
+    """Dict-based merge_edges, used when pandas is not installed."""
     # Group by (source, target)
     grouped = {}
     
@@ -144,9 +280,7 @@ def merge_organizations(orgs_list: List[Dict]) -> List[Dict]:
     """Merge organizations, keeping unique by ID."""
     seen = {}
     for org in orgs_list:
-        oid = org.get('id')
-        if oid not in seen:
-            seen[oid] = org
+        seen.setdefault(org.get('id'), org)
     return list(seen.values())
 
 def build():
@@ -209,21 +343,10 @@ def build():
             all_documents.append(doc_data)
         
         # Load people
-        people_data = load_json(str(people_file))
-        if isinstance(people_data, dict) and 'people' in people_data:
-            all_people.extend(people_data['people'])
-        elif isinstance(people_data, list):
-            all_people.extend(people_data)
+        all_people.extend(iter_json_items(str(people_file), ['people']))
         
-        # Load edges
-        edges_data = load_json(str(edges_file))
-        if isinstance(edges_data, dict) and 'edges' in edges_data:
-            all_edges.extend(edges_data['edges'])
-        elif isinstance(edges_data, dict) and 'edge' in edges_data:
-            # Handle singular "edge" key
-            all_edges.extend(edges_data['edge'])
-        elif isinstance(edges_data, list):
-            all_edges.extend(edges_data)
+        # Load edges (also handle singular "edge" key)
+        all_edges.extend(iter_json_items(str(edges_file), ['edges', 'edge']))
         
         # Load organizations
         orgs_data = load_json(str(org_file))
@@ -253,7 +376,8 @@ def build():
     print("Writing output files:\n")
     save_json(str(output_dir / "documents.json"), consolidated_documents)
     save_json(str(output_dir / "people.json"), consolidated_people)
-    save_json(str(output_dir / "edges.json"), consolidated_edges)
+    save_json(str(output_dir / "edges.json"), consolidated_edges,
+              schema=List[Edge] if msgspec is not None else None)
     save_json(str(output_dir / "organizations.json"), consolidated_organizations)
     save_json(str(output_dir / "cases.json"), consolidated_cases)
     
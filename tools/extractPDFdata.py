@@ -14,28 +14,30 @@ Outputs a JSON report (default: assets/data/pdf_duplicates.json).
 
 Requires: PyPDF2, datasketch
 Install: pip install PyPDF2 datasketch
+Optional: pymupdf (faster PDF text extraction), numba (JIT-compiled MinHash permutation loop), rapidfuzz (name matching)
 """
 
 import argparse
-import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain, combinations
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import re
 import shutil
 import copy
 import numpy as np
 
 try:
-    from PyPDF2 import PdfReader
+    from rapidfuzz import fuzz, process
 except Exception:
-    PdfReader = None
+    fuzz = process = None
 
-from datasketch import MinHash, MinHashLSH
-from difflib import SequenceMatcher
 
-from utilities import extract_data,normalize_text, sha256_file, find_pdfs,strip_middle_initial, find_index_people_in_text, score_person, BAD_NAME_TERMS, BAD_LAST_NAMES, PERSON_REGEX, ORG_REGEX, EMAIL_REGEX, URL_REGEX, extract_text_from_pdf, similarity,store_document_in_db
+from utilities import extract_data, normalize_name, find_pdfs,strip_middle_initial, find_index_people_in_text, index_cached, score_person, BAD_NAME_TERMS, BAD_LAST_NAMES, CONFIG, connect_db, store_document_in_db, ingest_pdf, BandedLSH, signature_to_b64
 
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
@@ -43,21 +45,46 @@ logger = logging.getLogger("pdf-dedupe-lsh")
 
 
 
-PEOPLE_INDEX = extract_data("SELECT * FROM people")
+@lru_cache(maxsize=1)
+def get_people_index() -> list[dict]:
+    """
+    People rows from the database, loaded on first use. Not done at import:
+    spawned pool workers re-run this script's top level as __mp_main__.
+    """
+    return list(extract_data("SELECT * FROM people"))
+
+
+def build_name_index(people_index: list[dict]) -> tuple[list[str], list[dict]]:
+    """Flatten people_index into normalized alias names and the person owning each alias."""
+    known_names = []
+    owners = []
+    for person in people_index:
+        for known in person["names"]:
+            known_names.append(normalize_name(known))
+            owners.append(person)
+    return known_names, owners
 
 
 def canonicalize_person(name: str, people_index: list[dict], threshold: float = 0.85) -> dict:
-    norm = normalize_text(strip_middle_initial(name))
+    norm = normalize_name(strip_middle_initial(name))
 
     best_match = None
     best_score = 0.0
 
-    for person in people_index:
-        for known in person["names"]:
-            score = score_person(norm, known)
-            if score > best_score:
-                best_score = score
-                best_match = person
+    if process is not None:
+        known_names, owners = index_cached(people_index, build_name_index)
+        match = process.extractOne(norm, known_names, scorer=fuzz.ratio)
+        if match is not None:
+            _, score, idx = match
+            best_score = score / 100.0
+            best_match = owners[idx]
+    else:
+        for person in people_index:
+            for known in person["names"]:
+                score = score_person(norm, known)
+                if score > best_score:
+                    best_score = score
+                    best_match = person
 
     if best_match and best_score >= threshold:
         return {
@@ -73,21 +100,81 @@ def canonicalize_person(name: str, people_index: list[dict], threshold: float =
     }
 
 
-def cluster_people(unresolved: list[str]) -> list[list[str]]:
-    clusters: list[list[str]] = []
+def name_bigrams(name: str) -> set[tuple[str, int]]:
+    """Bigrams of name, repeats numbered so multiset overlap is set overlap."""
+    seen: Counter = Counter()
+    grams = set()
+    for i in range(max(1, len(name) - 1)):
+        gram = name[i:i + 2]
+        grams.add((gram, seen[gram]))
+        seen[gram] += 1
+    return grams
 
-    for name in unresolved:
-        placed = False
-        for cluster in clusters:
-            if score_person(name, cluster[0]) > 0.85:
-                cluster.append(name)
-                placed = True
-                break
 
-        if not placed:
-            clusters.append([name])
+@lru_cache(maxsize=None)
+def min_shared_bigrams(la: int, lb: int) -> Optional[int]:
+    """
+    Fewest bigrams names of lengths la and lb must share to score above 0.85,
+    or None when the length difference alone rules the pair out.
+    """
+    # 0.15 * (la + lb) as 3 * (la + lb) / 20, in integers
+    if 20 * abs(la - lb) >= 3 * (la + lb):
+        return None
+    return max(1, max(la, lb) - 1 - 2 * -(-3 * (la + lb) // 20))
 
-    return clusters
+
+def cluster_people(unresolved: list[str]) -> list[list[str]]:
+    """
+    Group similar unresolved names, joining (union-find) pairs with
+    score_person > 0.85. That score is at most 1 - d / (la + lb) for Indel
+    distance d, so only pairs passing two exact filters are scored:
+    - length: d >= |la - lb|, so |la - lb| must be below 0.15 * (la + lb)
+    - bigram count: each edit destroys at most two bigrams, so the names must
+      share at least max(la, lb) - 1 - 2 * ceil(0.15 * (la + lb)) bigrams,
+      and at least one (with none in common the ratio is at most 0.8)
+    Candidates come from a prefix-filtered index: two names sharing t bigrams
+    share one among each name's len - t + 1 rarest, so only those are indexed.
+    """
+    # repeats of a name score 1.0 against it and always share its cluster
+    names = list(dict.fromkeys(unresolved))
+    grams = [name_bigrams(name) for name in names]
+    freq = Counter(chain.from_iterable(grams))
+
+    parent = list(range(len(names)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    index: dict[tuple[str, int], list[int]] = {}
+    for i, name in enumerate(names):
+        la = len(name)
+        # fewest bigrams this name can share with any length-compatible partner
+        need = min(filter(None, (min_shared_bigrams(la, lb) for lb in range(1, 2 * la + 1))), default=1)
+        prefix = sorted(grams[i], key=lambda g: (freq[g], g))[: len(grams[i]) - need + 1]
+
+        # query before insert: each candidate pair is scored once
+        candidates = set()
+        for gram in prefix:
+            candidates.update(index.get(gram, ()))
+        for j in candidates:
+            need = min_shared_bigrams(la, len(names[j]))
+            if need is None or len(grams[i] & grams[j]) < need:
+                continue
+            if score_person(name, names[j]) > 0.85:
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+        for gram in prefix:
+            index.setdefault(gram, []).append(i)
+
+    position = {name: i for i, name in enumerate(names)}
+    clusters: dict[int, list[str]] = {}
+    for name in unresolved:
+        clusters.setdefault(find(position[name]), []).append(name)
+    return list(clusters.values())
 
 
 def clean_people_list(people: list[str]) -> list[str]:
@@ -111,13 +198,13 @@ def filter_bad_lastnames(people: list[str]) -> list[str]:
 
 def extract_entities_from_text(text: str) -> dict:
     # raw regex hits
-    raw_people = list(set(PERSON_REGEX.findall(text)))
-    orgs = list(set(ORG_REGEX.findall(text)))
-    emails = list(set(EMAIL_REGEX.findall(text)))
-    urls = list(set(URL_REGEX.findall(text)))
+    raw_people = list(set(CONFIG.person_regex.findall(text)))
+    orgs = list(set(CONFIG.org_regex.findall(text)))
+    emails = list(set(CONFIG.email_regex.findall(text)))
+    urls = list(set(CONFIG.url_regex.findall(text)))
 
     # find known people directly in text
-    index_hits = find_index_people_in_text(text, PEOPLE_INDEX)
+    index_hits = find_index_people_in_text(text, get_people_index())
 
     
 
@@ -134,11 +221,11 @@ def extract_entities_from_text(text: str) -> dict:
     unresolved_people = []
 
     for name in combined_people:
-        result = canonicalize_person(name, PEOPLE_INDEX)
+        result = canonicalize_person(name, get_people_index())
         if result["id"]:
             resolved_people.append(result)
         else:
-            unresolved_people.append(normalize_text(name))
+            unresolved_people.append(normalize_name(name))
 
     clustered_unresolved = cluster_people(unresolved_people)
 
@@ -153,27 +240,6 @@ def extract_entities_from_text(text: str) -> dict:
     }
 
 
-# ---------------------- MINHASH / LSH ---------------------- #
-
-def text_to_shingles(text: str, k: int = 3) -> List[str]:
-    """Convert text into k-word shingles."""
-    words = text.split()
-    if len(words) < k:
-        return [" ".join(words)] if words else []
-    return [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
-
-
-def build_minhash(text: str, num_perm: int = 128) -> MinHash:
-    m = MinHash(num_perm=num_perm)
-    shingles = text_to_shingles(text, k=3)
-    if not shingles:
-        m.update(b"")
-        return m
-    for sh in shingles:
-        m.update(sh.encode("utf-8"))
-    return m
-
-
 # ---------------------- CORE REPORT BUILDING ---------------------- #
 
 def build_report(
@@ -188,7 +254,11 @@ def build_report(
     Build a report of duplicate / similar PDFs using:
     - exact SHA-256 for exact duplicates
     - MinHash + LSH for candidate near/partial duplicates
-    - SequenceMatcher only on LSH candidates
+    - vectorized MinHash Jaccard estimates to verify LSH candidates
+      (standard error ~1/sqrt(num_perm); raise num_perm for tighter estimates)
+
+    File entries carry text_sha256 instead of the text itself; the extracted
+    text is returned under report["texts"] (path -> text) for in-process use.
     """
     items: List[Dict[str, Any]] = []
     logger.info(f"Scanning {len(files)} PDF files...")
@@ -206,31 +276,19 @@ def build_report(
                 "size": size,
                 "sha256": None,
                 "text": None,
+                "text_sha256": None,
                 "pages": None,
-                "minhash": None,  # will store list[int] for signature
+                "minhash": None,  # will store uint32 signature array
             }
         )
 
-    # Compute sha256, pages, text, and MinHash
+    # Compute sha256, pages, text, and MinHash: files are independent, so
+    # each one is ingested in its own worker process.
     logger.info("Extracting text, hashes, and MinHash signatures...")
-    for it in items:
-        path = Path(it["path"])
-        it["sha256"] = sha256_file(path)
-
-        if PdfReader is not None:
-            try:
-                reader = PdfReader(str(path))
-                it["pages"] = len(reader.pages)
-            except Exception:
-                it["pages"] = None
-        else:
-            it["pages"] = None
-
-        text = extract_text_from_pdf(path)
-        it["text"] = normalize_text(text)
-
-        m = build_minhash(text, num_perm=num_perm)
-        it["minhash"] = [int(x) for x in m.hashvalues]
+    with ProcessPoolExecutor() as ex:
+        results = list(ex.map(partial(ingest_pdf, num_perm=num_perm), [it["path"] for it in items], chunksize=4))
+    for it, res in zip(items, results):
+        it.update(res)
 
     # Filter by min_pages if provided
     if min_pages > 0:
@@ -255,10 +313,10 @@ def build_report(
                         {
                             "path": g["path"],
                             "size": g["size"],
-                            "text": g.get("text"),
+                            "text_sha256": g["text_sha256"],
                             "sha256": g["sha256"],
                             "pages": g["pages"],
-                            "minhash": g["minhash"],
+                            "minhash": signature_to_b64(g["minhash"]),
                         }
                         for g in group
                     ],
@@ -272,46 +330,38 @@ def build_report(
     n = len(remaining)
     logger.info(f"Building LSH index for {n} remaining files...")
 
-    lsh = MinHashLSH(threshold=lsh_threshold, num_perm=num_perm)
-    minhashes: Dict[str, MinHash] = {}
-
+    lsh = BandedLSH(threshold=lsh_threshold, num_perm=num_perm)
     for it in remaining:
-        m = MinHash(num_perm=num_perm)
-        m.hashvalues = np.array(it["minhash"], dtype=np.uint64)
-        key = it["path"]
-        minhashes[key] = m
-        lsh.insert(key, m)
+        lsh.insert(it["path"], it["minhash"])
 
     logger.info("Querying LSH for candidate near-duplicates...")
     used_in_group = set()
+    # Position of each remaining file, to keep candidates in scan order
+    remaining_index = {it["path"]: i for i, it in enumerate(remaining)}
 
     for it in remaining:
         key = it["path"]
         if key in used_in_group:
             continue
 
-        m = minhashes[key]
-        candidates = lsh.query(m)
-        if key not in candidates:
-            candidates.append(key)
+        cand_set = set(lsh.query(it["minhash"]))
+        cand_set.add(key)
+        cand_set -= used_in_group
 
-        group_items = [x for x in remaining if x["path"] in candidates and x["path"] not in used_in_group]
+        group_items = [remaining[i] for i in sorted(remaining_index[p] for p in cand_set)]
         if len(group_items) <= 1:
             continue
 
-        final_group = [group_items[0]]
-        for cand in group_items[1:]:
-            sim = similarity(group_items[0]["text"], cand["text"])
-            if sim >= partial_thresh:
-                final_group.append(cand)
+        # MinHash Jaccard estimates (fraction of equal signature slots) decide
+        # both membership and group type.
+        sigs = np.stack([x["minhash"] for x in group_items])
+        est = (sigs[0] == sigs[1:]).mean(axis=1)
+        final_group = [group_items[0]] + [cand for cand, sim in zip(group_items[1:], est) if sim >= partial_thresh]
 
         if len(final_group) > 1:
-            max_sim = 0.0
-            for a in final_group:
-                for b in final_group:
-                    if a is b:
-                        continue
-                    max_sim = max(max_sim, similarity(a["text"], b["text"]))
+            fsigs = np.stack([x["minhash"] for x in final_group])
+            pair_est = (fsigs[:, None, :] == fsigs[None, :, :]).mean(axis=2)
+            max_sim = float(np.max(pair_est[np.triu_indices(len(final_group), k=1)]))
             gtype = "near" if max_sim >= near_thresh else "partial"
 
             groups.append(
@@ -321,10 +371,10 @@ def build_report(
                         {
                             "path": g["path"],
                             "size": g["size"],
-                            "text": g.get("text"),
+                            "text_sha256": g["text_sha256"],
                             "sha256": g["sha256"],
                             "pages": g["pages"],
-                            "minhash": g["minhash"],
+                            "minhash": signature_to_b64(g["minhash"]),
                         }
                         for g in final_group
                     ],
@@ -350,13 +400,15 @@ def build_report(
             {
                 "path": s["path"],
                 "size": s["size"],
-                "text": s.get("text"),
+                "text_sha256": s["text_sha256"],
                 "sha256": s.get("sha256"),
                 "pages": s.get("pages"),
-                "minhash": s.get("minhash"),
+                "minhash": signature_to_b64(s["minhash"]),
             }
             for s in singletons
         ],
+        # Extracted text per path, kept in memory only (not written to the report file)
+        "texts": {it["path"]: it["text"] for it in items},
     }
     return report
 
@@ -404,18 +456,16 @@ def build_org_json(doc_id: str, orgs: list[str]) -> dict:
 
 
 def build_edges_json(doc_id: str, person_ids: list[str]) -> dict:
-    edges = []
-    for i, p1 in enumerate(person_ids):
-        for p2 in person_ids[i + 1 :]:
-            edges.append(
-                {
-                    "edge_id": f"edge_{doc_id}_{len(edges)+1}",
-                    "source": p1,
-                    "target": p2,
-                    "relationship": "co_mentioned",
-                    "weight": 1,
-                }
-            )
+    edges = [
+        {
+            "edge_id": f"edge_{doc_id}_{k}",
+            "source": p1,
+            "target": p2,
+            "relationship": "co_mentioned",
+            "weight": 1,
+        }
+        for k, (p1, p2) in enumerate(combinations(person_ids, 2), start=1)
+    ]
     return {
         "document_id": doc_id,
         "edges": edges,
@@ -442,18 +492,23 @@ def process_singletons_to_db(report: Dict[str, Any]) -> None:
     singletons = report.get("singletons", [])
     logger.info(f"Processing {len(singletons)} singletons into SQLite...")
 
-    for s in singletons:
-        text = s.get("text", "") or ""
-        entities = extract_entities_from_text(text)
+    conn = connect_db()
+    try:
+        for s in singletons:
+            text = report["texts"].get(s["path"]) or ""
+            entities = extract_entities_from_text(text)
 
-        doc_id = f"doc_Dataset12_{Path(s['path']).stem}"
+            doc_id = f"doc_Dataset12_{Path(s['path']).stem}"
 
-        store_document_in_db(
-            doc_id=doc_id,
-            canonical=s,
-            text=text,
-            entities=entities
-        )
+            store_document_in_db(
+                conn,
+                doc_id=doc_id,
+                canonical=s,
+                text=text,
+                entities=entities
+            )
+    finally:
+        conn.close()
 
     logger.info("Singletons stored in SQLite.")
 
@@ -471,13 +526,13 @@ def main():
         "--near",
         type=float,
         default=0.90,
-        help="Similarity threshold for near-duplicates (SequenceMatcher, default 0.90)",
+        help="Similarity threshold for near-duplicates (MinHash Jaccard, default 0.90)",
     )
     p.add_argument(
         "--partial",
         type=float,
         default=0.60,
-        help="Similarity threshold for partial duplicates (SequenceMatcher, default 0.60)",
+        help="Similarity threshold for partial duplicates (MinHash Jaccard, default 0.60)",
     )
     p.add_argument("--min-pages", type=int, default=0, help="Minimum page count to include (default 0)")
     p.add_argument(
@@ -529,7 +584,7 @@ def main():
         outp = Path(args.out)
         outp.parent.mkdir(parents=True, exist_ok=True)
         with outp.open("w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+            json.dump({k: v for k, v in report.items() if k != "texts"}, f, indent=2, ensure_ascii=False)
         logger.info(f"Wrote report to {outp}")
 
     logger.info(json.dumps(report["summary"], indent=2))
@@ -1,99 +1,425 @@
 import sqlite3
 import re
-from datasketch import MinHash, MinHashLSH
+import base64
+import json
+from datasketch import LeanMinHash
 from difflib import SequenceMatcher
 import hashlib
+import io
 import logging
+import os
+import sys
+import threading
+import zlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from functools import lru_cache, partial
+from itertools import chain, combinations
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 try:
     from PyPDF2 import PdfReader
 except Exception:
     PdfReader = None
+try:
+    import pymupdf
+except Exception:
+    try:
+        import fitz as pymupdf  # PyMuPDF < 1.24 only exposes the legacy name
+    except Exception:
+        pymupdf = None
+try:
+    from numba import njit
+except Exception:
+    njit = None
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
+try:
+    import re2
+except Exception:
+    re2 = None
+try:
+    from rapidfuzz import fuzz, process
+except Exception:
+    fuzz = process = None
 
 
 
 # ---------------------- CONFIG / CONSTANTS ---------------------- #
 
-# PERSON_REGEX: matches first [middle initial] last name, excludes place name prefixes and street/city suffixes
-PERSON_REGEX = re.compile(
-    r"\b(?!New\b|North\b|South\b|East\b|West\b)"
-    r"([A-Z][a-z]+ (?:[A-Z]\.? )?[A-Z][a-z]+)"
-    r"\b(?!\s+(?:Street|St|Avenue|Ave|Road|Rd|Lane|Ln|Drive|Dr|Boulevard|Blvd|City|County|Province|State|privileged|district|region|States))"
+# normalize_text
+WHITESPACE_RUN = re.compile(r"\s+")
+CAMEL_JOIN = re.compile(r"([a-z])([A-Z])")
+
+# The URL pattern uses RE2 (linear-time DFA, no backtracking) when available.
+# RE2's \w, \s and \b are ASCII-only, so the others stay on `re`: the person
+# pattern relies on lookaheads, and the org/email patterns need Unicode \b and \w
+# (RE2 would drop "josé.müller@exämple.com"), which RE2 cannot express.
+DFA_RE = re2 if re2 is not None else re
+# Python's Unicode \s, spelled out so the URL pattern behaves the same under RE2
+UNICODE_SPACE = "\t-\r\x1c-\x20\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+
+
+@dataclass
+class Config:
+    """
+    Settings that callers may override at runtime: the database path and the
+    entity patterns. Change them through configure() so the patterns are
+    recompiled; functions read CONFIG at call time. Data already loaded and
+    cached (e.g. extractPDFdata.get_people_index()) is not reloaded by an override.
+    """
+    db_path: str = "tools/epstein.db"
+    # first [middle initial] last name, excluding place name prefixes and street/city suffixes
+    person_pattern: str = (
+        r"\b(?!New\b|North\b|South\b|East\b|West\b)"
+        r"([A-Z][a-z]+ (?:[A-Z]\.? )?[A-Z][a-z]+)"
+        r"\b(?!\s+(?:Street|St|Avenue|Ave|Road|Rd|Lane|Ln|Drive|Dr|Boulevard|Blvd|City|County|Province|State|privileged|district|region|States))"
+    )
+    org_pattern: str = r"\b([A-Z][A-Za-z]+ (Inc|LLC|Corp|Foundation|Institute|Agency))\b"
+    email_pattern: str = r"\b[\w\.-]+@[\w\.-]+\.\w+\b"
+    url_pattern: str = "https?://[^" + UNICODE_SPACE + "]+"
+    person_regex: Any = field(init=False, repr=False)
+    org_regex: Any = field(init=False, repr=False)
+    email_regex: Any = field(init=False, repr=False)
+    url_regex: Any = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.compile()
+
+    def compile(self) -> None:
+        self.person_regex = re.compile(self.person_pattern)
+        self.org_regex = re.compile(self.org_pattern)
+        self.email_regex = re.compile(self.email_pattern)
+        self.url_regex = DFA_RE.compile(self.url_pattern)
+
+
+CONFIG = Config()
+
+
+def configure(**overrides: Any) -> Config:
+    """Update CONFIG in place (e.g. configure(db_path="other.db")) and recompile its patterns."""
+    settable = {f.name for f in fields(Config) if f.init}
+    unknown = set(overrides) - settable
+    if unknown:
+        raise TypeError(f"Unknown config field(s): {', '.join(sorted(unknown))}")
+    for name, value in overrides.items():
+        setattr(CONFIG, name, value)
+    CONFIG.compile()
+    _export_config()
+    return CONFIG
+
+
+def _export_config() -> None:
+    # module-level names kept for existing `from utilities import ...` callers
+    global DB_PATH, PERSON_REGEX, ORG_REGEX, EMAIL_REGEX, URL_REGEX
+    DB_PATH = CONFIG.db_path
+    PERSON_REGEX = CONFIG.person_regex
+    ORG_REGEX = CONFIG.org_regex
+    EMAIL_REGEX = CONFIG.email_regex
+    URL_REGEX = CONFIG.url_regex
+
+
+_export_config()
+
+# MinHash permutation parameters (same scheme as datasketch: (a*h + b) mod p, 32-bit values)
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+SHINGLE_MIX = np.uint64(0x9E3779B97F4A7C15)
+# Hash values never exceed MAX_HASH, so signatures are stored losslessly as uint32
+SIGNATURE_DTYPE = np.dtype("<u4")
+# Shingles per NumPy permutation block in minhash_vectorized
+MINHASH_BLOCK = 4096
+
+# sha256_file read buffer on Pythons without hashlib.file_digest
+HASH_BUFFER_SIZE = 1 << 20
+# PyPDF2 issues many small reads (byte-at-a-time for inline images)
+PDF_BUFFER_SIZE = 1 << 20
+
+# find_index_people_in_text: structures derived from a people index, keyed by (builder, id())
+PEOPLE_INDEX_CACHE: Dict[Tuple[str, int], Any] = {}
+# Characters lowercased and scanned at a time
+ALIAS_SCAN_WINDOW = 1 << 20
+
+# extract_data connection settings (one connection per thread, see get_connection)
+READ_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA cache_size=-200000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
 )
-ORG_REGEX = re.compile(r"\b([A-Z][A-Za-z]+ (Inc|LLC|Corp|Foundation|Institute|Agency))\b")
-EMAIL_REGEX = re.compile(r"\b[\w\.-]+@[\w\.-]+\.\w+\b")
-URL_REGEX = re.compile(r"https?://\S+")
+DB_LOCAL = threading.local()
+FETCH_BATCH_SIZE = 1000
 
-# Path to your database file
-DB_PATH = "tools/epstein.db"
+# Multi-row edge inserts, sized to SQLite's default 999 bound-parameter limit
+SQLITE_MAX_PARAMS = 999
+EDGE_INSERT_SQL = "INSERT OR IGNORE INTO edges (document_id, source, target, relationship) VALUES "
+EDGE_VALUES_ROW = "(?, ?, ?, 'co_mentioned')"
+EDGE_ROWS_PER_INSERT = SQLITE_MAX_PARAMS // 3
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger("utilities")
 
 # ---------------------- Utilities ---------------------- #
-def extract_data(query: str):
-    # Connect to the database
-    conn = sqlite3.connect(DB_PATH)
-
-    # This lets you access columns by name instead of index
-    conn.row_factory = sqlite3.Row
-
-    # Create a cursor
-    cur = conn.cursor()
+def get_connection() -> sqlite3.Connection:
+    """
+    Persistent read connection to CONFIG.db_path, one per thread (and per
+    process). Reopened when configure() has changed the path since.
+    """
+    pid, path, conn = getattr(DB_LOCAL, "conn", (None, None, None))
+    if conn is None or pid != os.getpid() or path != CONFIG.db_path:
+        # autocommit; let SQLite mmap the file and keep a large page cache
+        conn = sqlite3.connect(CONFIG.db_path, isolation_level=None)
+        for pragma in READ_PRAGMAS:
+            conn.execute(pragma)
+
+        # This lets you access columns by name instead of index
+        conn.row_factory = sqlite3.Row
+        DB_LOCAL.conn = (os.getpid(), CONFIG.db_path, conn)
+    return conn
+
+def extract_data(query: str) -> Iterator[dict]:
+    """Yield the query's rows as dicts, fetched FETCH_BATCH_SIZE at a time; list() it if needed."""
+    # Reuse the thread's connection instead of reopening the database per query
+    cur = get_connection().cursor()
+    cur.arraysize = FETCH_BATCH_SIZE
 
     # Run a query
     cur.execute(query)
-    table = [dict(row) for row in cur.fetchall()]
-
-    # Always close when done
-    conn.close()
-
-    return table
+    while True:
+        rows = cur.fetchmany()
+        if not rows:
+            break
+        for row in rows:
+            yield dict(row)
+
+def iter_pdfs(root) -> Iterator[Path]:
+    # os.scandir entries carry their file type, so no extra stat per entry
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        # unreadable or vanished directory: skipped, as Path.rglob does
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_pdfs(entry.path)
+            # normcase: case-insensitive on Windows, like rglob("*.pdf")
+            elif os.path.normcase(entry.name).endswith(".pdf") and entry.is_file():
+                yield Path(entry.path)
 
 def find_pdfs(root: Path) -> List[Path]:
-    pdfs = []
-    for p in root.rglob("*.pdf"):
-        if p.is_file():
-            pdfs.append(p)
-    return sorted(pdfs)
+    return sorted(iter_pdfs(root))
 
 def normalize_text(text: str) -> str:
-    text = text.replace("\n", " ")
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)  # broken OCR joins
+    text = WHITESPACE_RUN.sub(" ", text)  # also covers newlines
+    text = CAMEL_JOIN.sub(r"\1 \2", text)  # broken OCR joins
     return text.strip()
 
-def similarity(a: str, b: str) -> float:
-    """Fallback expensive similarity (SequenceMatcher) used only on LSH candidates."""
+@lru_cache(maxsize=100_000)
+def normalize_name(name: str) -> str:
+    """normalize_text for short, frequently repeated strings such as person names."""
+    return normalize_text(name)
+
+def string_ratio(a: str, b: str, use_slow: bool = False) -> float:
+    """Normalized Indel similarity via RapidFuzz, or difflib's SequenceMatcher ratio."""
+    if use_slow or fuzz is None:
+        return SequenceMatcher(None, a, b).ratio()
+    return fuzz.ratio(a, b) / 100.0
+
+def similarity_matrix(queries: List[str], candidates: List[str], workers: int = -1) -> np.ndarray:
+    """Pairwise similarity (len(queries) x len(candidates)); RapidFuzz cdist runs on all cores."""
+    if process is None:
+        return np.array([[similarity(q, c) for c in candidates] for q in queries])
+    return process.cdist(queries, candidates, scorer=fuzz.ratio, workers=workers) / 100.0
+
+def similarity(a: str, b: str, use_slow: bool = False) -> float:
+    """Text similarity in [0, 1] (RapidFuzz ratio; SequenceMatcher if use_slow or RapidFuzz is missing)."""
     if not a and not b:
         return 1.0
-    return SequenceMatcher(None, a, b).ratio()
+    return string_ratio(a, b, use_slow=use_slow)
 
-def sha256_file(path: Path, chunk_size: int = 8192) -> str:
-    h = hashlib.sha256()
+def sha256_file(path: Path, chunk_size: int = HASH_BUFFER_SIZE) -> str:
+    """
+    SHA-256 of a file. Uses hashlib.file_digest (C read loop) on Python 3.11+;
+    otherwise reads into one reusable chunk_size buffer.
+    """
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            h.update(chunk)
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
+        n = f.readinto(buf)
+        while n:
+            h.update(view[:n])
+            n = f.readinto(buf)
     return h.hexdigest()
 
-def text_to_shingles(text: str, k: int = 3) -> List[str]:
-    """Convert text into k-word shingles."""
-    words = text.split()
-    if len(words) < k:
-        return [" ".join(words)] if words else []
-    return [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
-
-def build_minhash(text: str, num_perm: int = 128) -> MinHash:
-    m = MinHash(num_perm=num_perm)
-    shingles = text_to_shingles(text, k=3)
-    if not shingles:
-        m.update(b"")
-        return m
-    for sh in shingles:
-        m.update(sh.encode("utf-8"))
-    return m 
+def init_permutations(num_perm: int, seed: int = 1) -> np.ndarray:
+    """Permutation parameters (a, b) as generated by datasketch's MinHash."""
+    gen = np.random.RandomState(seed)
+    return np.array(
+        [
+            (
+                gen.randint(1, MERSENNE_PRIME, dtype=np.uint64),
+                gen.randint(0, MERSENNE_PRIME, dtype=np.uint64),
+            )
+            for _ in range(num_perm)
+        ],
+        dtype=np.uint64,
+    ).T
+
+
+PERMUTATIONS = {128: init_permutations(128)}
+
+
+def minhash_update(hashes, a, b, out):
+    """Fold the permuted values of every shingle hash into the running minima in out."""
+    for i in range(len(hashes)):
+        h = hashes[i]
+        for j in range(len(a)):
+            v = ((a[j] * h + b[j]) % MERSENNE_PRIME) & MAX_HASH
+            if v < out[j]:
+                out[j] = v
+
+
+if njit is not None:
+    minhash_update = njit(fastmath=True, cache=True)(minhash_update)
+
+
+def get_permutations(num_perm: int) -> np.ndarray:
+    if num_perm not in PERMUTATIONS:
+        PERMUTATIONS[num_perm] = init_permutations(num_perm)
+    return PERMUTATIONS[num_perm]
+
+
+def token_hashes(tokens: List[bytes]) -> np.ndarray:
+    """CRC-32 of each token. Stdlib only, so signatures never depend on optional packages."""
+    return np.fromiter(map(zlib.crc32, tokens), dtype=np.uint64, count=len(tokens))
+
+
+def shingle_hashes(text: str, k: int = 3) -> np.ndarray:
+    """32-bit hash of each k-word shingle, combined from per-token hashes without building shingle strings."""
+    tokens = text.encode("utf-8").split()
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    th = token_hashes(tokens)
+    n = len(th) - min(k, len(th)) + 1
+    h = th[:n].copy()
+    # each token is hashed once; shingles fold k consecutive token hashes
+    for j in range(1, min(k, len(th))):
+        h = h * SHINGLE_MIX ^ th[j:j + n]
+    return (h ^ (h >> np.uint64(32))) & MAX_HASH
+
+
+def minhash_vectorized(hashes: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Apply all permutations to all hashes with NumPy broadcasting and take the minima."""
+    out = np.full(len(a), MAX_HASH, dtype=np.uint64)
+    # (num_perm x block) intermediate; blocks bound memory on long documents
+    for start in range(0, len(hashes), MINHASH_BLOCK):
+        block = hashes[None, start:start + MINHASH_BLOCK]
+        perm = ((a[:, None] * block + b[:, None]) % MERSENNE_PRIME) & MAX_HASH
+        np.minimum(out, perm.min(axis=1), out=out)
+    return out
+
+
+def build_minhash(text: str, num_perm: int = 128, k: int = 3) -> np.ndarray:
+    """MinHash signature (uint64 array of num_perm values) of the k-word shingles of text."""
+    a, b = get_permutations(num_perm)
+
+    hashes = shingle_hashes(text, k=k)
+    if len(hashes) == 0:
+        return np.full(num_perm, MAX_HASH, dtype=np.uint64)
+    if njit is None:
+        return minhash_vectorized(hashes, a, b)
+
+    # same hashes and permutations as minhash_vectorized, without the (num_perm x block) temporaries
+    out = np.full(num_perm, MAX_HASH, dtype=np.uint64)
+    minhash_update(hashes, a, b, out)
+    return out
+
+def lean_minhash(sig: np.ndarray, seed: int = 1) -> LeanMinHash:
+    """Wrap a signature from build_minhash for MinHashLSH without generating permutations."""
+    return LeanMinHash(seed=seed, hashvalues=np.asarray(sig, dtype=np.uint64))
+
+@lru_cache(maxsize=None)
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    (bands, rows) for banded LSH minimizing the false positive + false negative
+    area under the collision curve 1 - (1 - s^r)^b, as datasketch's MinHashLSH does.
+    """
+    s = np.linspace(0.0, 1.0, 1001)
+    below, above = s < threshold, s >= threshold
+    best, best_err = (1, num_perm), float("inf")
+    for b in range(1, num_perm + 1):
+        for r in range(1, num_perm // b + 1):
+            p = 1.0 - (1.0 - s ** r) ** b
+            err = p[below].mean() * threshold + (1.0 - p[above]).mean() * (1.0 - threshold)
+            if err < best_err:
+                best, best_err = (b, r), err
+    return best
+
+
+class BandedLSH:
+    """
+    Compact MinHash LSH index. Each signature is cut into b bands of r values;
+    every band is hashed to one int key and stored in a plain dict per band
+    (band key -> list of int ids). Keys sharing any band key are candidates.
+    Holds far less than datasketch's MinHashLSH, which keeps a bytes key per
+    band and a set per bucket.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128):
+        self.b, self.r = optimal_bands(threshold, num_perm)
+        self.tables: List[Dict[int, List[int]]] = [{} for _ in range(self.b)]
+        self.keys: List[Any] = []
+
+    def band_keys(self, sig: np.ndarray) -> List[int]:
+        # all b band keys in one pass over the (b, r) view: a multiply-xor fold
+        # across the r columns, without a bytes object or hash call per band
+        bands = np.asarray(sig[: self.b * self.r], dtype=np.uint64).reshape(self.b, self.r)
+        keys = bands[:, 0].copy()
+        for j in range(1, self.r):
+            keys = keys * SHINGLE_MIX ^ bands[:, j]
+        return keys.tolist()
+
+    def insert(self, key: Any, sig: np.ndarray) -> None:
+        idx = len(self.keys)
+        self.keys.append(key)
+        for table, band_key in zip(self.tables, self.band_keys(sig)):
+            table.setdefault(band_key, []).append(idx)
+
+    def query(self, sig: np.ndarray) -> List[Any]:
+        found = set()
+        for table, band_key in zip(self.tables, self.band_keys(sig)):
+            found.update(table.get(band_key, ()))
+        return [self.keys[i] for i in found]
+
+
+def _minhash_bytes(text: str, num_perm: int = 128) -> bytes:
+    # raw uint32 signature: much cheaper to pickle back than a MinHash object
+    return build_minhash(text, num_perm=num_perm).astype(SIGNATURE_DTYPE).tobytes()
+
+def build_minhashes_parallel(texts: List[str], num_perm: int = 128, workers: Optional[int] = None) -> List[LeanMinHash]:
+    """MinHash many texts across a process pool; results are LeanMinHash, in input order."""
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as ex:
+        blobs = list(ex.map(partial(_minhash_bytes, num_perm=num_perm), texts, chunksize=64))
+    return [lean_minhash(np.frombuffer(blob, dtype=SIGNATURE_DTYPE)) for blob in blobs]
+
+def signature_to_b64(sig: np.ndarray) -> str:
+    """Serialize a MinHash signature as base64 of its little-endian uint32 bytes."""
+    return base64.b64encode(np.asarray(sig, dtype=SIGNATURE_DTYPE).tobytes()).decode("ascii")
 
+
+def signature_from_b64(data: str) -> np.ndarray:
+    """Inverse of signature_to_b64."""
+    return np.frombuffer(base64.b64decode(data), dtype=SIGNATURE_DTYPE)
+
+
+@lru_cache(maxsize=100_000)
 def strip_middle_initial(name: str) -> str:
     """
     Remove middle initials like 'A.' or 'A' from names such as:
@@ -103,106 +429,213 @@ def strip_middle_initial(name: str) -> str:
     parts = name.split()
     if len(parts) == 3:
         first, mid, last = parts
-        if re.fullmatch(r"[A-Z]\.?", mid):
+        # plain string test for [A-Z]\.? (ASCII capital, optional period)
+        if "A" <= mid[0] <= "Z" and (len(mid) == 1 or (len(mid) == 2 and mid[1] == ".")):
             return f"{first} {last}"
     return name
 
-def score_person(candidate: str, known_name: str) -> float:
-    return SequenceMatcher(None, candidate, known_name).ratio()
+@lru_cache(maxsize=1_000_000)
+def _score_cached(a: str, b: str) -> float:
+    return string_ratio(a, b)
+
+def score_person(candidate: str, known_name: str, use_slow: bool = False) -> float:
+    if use_slow:
+        return string_ratio(candidate, known_name, use_slow=True)
+    # the score is treated as symmetric, so cache on the ordered pair
+    if known_name < candidate:
+        candidate, known_name = known_name, candidate
+    return _score_cached(candidate, known_name)
+
+def read_pdf(path: Path) -> Tuple[str, Optional[int]]:
+    """
+    Extract text and page count from a PDF with a single open, using PyMuPDF
+    when installed and PyPDF2 otherwise. Returns ("", None) if neither works.
+    """
+    if pymupdf is not None:
+        try:
+            with pymupdf.open(str(path)) as doc:
+                return "\n".join(page.get_text("text") for page in doc), len(doc)
+        except Exception as e:
+            logger.debug(f"Failed to extract text from {path}: {e}")
+            return "", None
 
-def extract_text_from_pdf(path: Path) -> str:
-    """Extract textual content from PDF using PyPDF2. If unavailable, return empty string."""
     if PdfReader is None:
-        return ""
+        return "", None
     try:
-        reader = PdfReader(str(path))
-        texts = []
-        for p in reader.pages:
-            try:
-                txt = p.extract_text() or ""
-            except Exception:
-                txt = ""
-            texts.append(txt)
-        return "\n".join(texts)
+        # PyPDF2 reads the stream lazily, so the file stays open while pages are extracted
+        with open(path, "rb", buffering=PDF_BUFFER_SIZE) as f:
+            reader = PdfReader(f)
+            # pages are written as they are extracted so no per-page list is kept alive
+            buf = io.StringIO()
+            for i, p in enumerate(reader.pages):
+                if i:
+                    buf.write("\n")
+                try:
+                    buf.write(p.extract_text() or "")
+                except Exception:
+                    pass
+            return buf.getvalue(), len(reader.pages)
     except Exception as e:
         logger.debug(f"Failed to extract text from {path}: {e}")
-        return ""
-    
+        return "", None
 
-def similarity(a: str, b: str) -> float:
-    """Fallback expensive similarity (SequenceMatcher) used only on LSH candidates."""
-    if not a and not b:
-        return 1.0
-    return SequenceMatcher(None, a, b).ratio()
+def extract_text_from_pdf(path: Path) -> str:
+    """Extract textual content from PDF (PyMuPDF, else PyPDF2). If unavailable, return empty string."""
+    return read_pdf(path)[0]
 
+def extract_texts_parallel(paths: List[Path], workers: Optional[int] = None) -> Dict[Path, str]:
+    """Extract text from many PDFs across a process pool (PDF parsing holds the GIL)."""
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as ex:
+        return dict(zip(paths, ex.map(extract_text_from_pdf, paths, chunksize=4)))
 
-def find_pdfs(root: Path) -> List[Path]:
-    pdfs = []
-    for p in root.rglob("*.pdf"):
-        if p.is_file():
-            pdfs.append(p)
-    return sorted(pdfs)
+def ingest_pdf(path_str: str, num_perm: int = 128) -> Dict[str, Any]:
+    """
+    Hash, page-count, text-extract and MinHash a single PDF. Lives here rather
+    than in extractPDFdata so pool workers do not import that module, which
+    queries the database at import time.
+    """
+    path = Path(path_str)
+    text, pages = read_pdf(path)
+    sig = build_minhash(text, num_perm=num_perm)
+    norm_text = normalize_text(text)
+
+    return {
+        "sha256": sha256_file(path),
+        "pages": pages,
+        "text": norm_text,
+        "text_sha256": hashlib.sha256(norm_text.encode("utf-8")).hexdigest(),
+        "minhash": sig.astype(SIGNATURE_DTYPE),
+    }
+
+def build_alias_automaton(people_index: list[dict]):
+    """
+    Aho-Corasick automaton over lowercase aliases; values are (person_idx, alias_idx)
+    lists. Returns (automaton, length of the longest alias).
+    """
+    automaton = ahocorasick.Automaton()
+    longest = 0
+    for pi, person in enumerate(people_index):
+        for ai, known in enumerate(person["names"]):
+            key = known.lower()
+            if not key:
+                continue
+            longest = max(longest, len(key))
+            if key in automaton:
+                automaton.get(key).append((pi, ai))
+            else:
+                automaton.add_word(key, [(pi, ai)])
+    automaton.make_automaton()
+    return automaton, longest
+
+def build_lowered_aliases(people_index: list[dict]) -> List[List[Tuple[str, str]]]:
+    """Per person, (alias, interned lowercase alias) pairs; repeated aliases share one string."""
+    return [[(known, sys.intern(known.lower())) for known in person["names"]] for person in people_index]
+
+def index_cached(people_index: list[dict], builder):
+    # one result per (builder, index list), built on first use
+    key = (builder.__name__, id(people_index))
+    cached = PEOPLE_INDEX_CACHE.get(key)
+    if cached is None or cached[0] is not people_index:
+        cached = PEOPLE_INDEX_CACHE[key] = (people_index, builder(people_index))
+    return cached[1]
 
 def find_index_people_in_text(text: str, people_index: list[dict]) -> list[str]:
+    if ahocorasick is not None:
+        automaton, longest = index_cached(people_index, build_alias_automaton)
+        if len(automaton) == 0:
+            return []
+        # Scan lowercased windows instead of a full lowered copy of the text.
+        # Windows overlap by longest-1 chars so no alias can straddle a boundary
+        # unseen; repeated matches in the overlap are harmless.
+        matched = {}
+        step = ALIAS_SCAN_WINDOW
+        for start in range(0, max(len(text), 1), step):
+            window = text[start:start + step + longest - 1].lower()
+            for _, pairs in automaton.iter(window):
+                for pi, ai in pairs:
+                    if ai < matched.get(pi, ai + 1):
+                        matched[pi] = ai
+        # keep each person's first listed alias that matched, in index order
+        return [people_index[pi]["names"][ai] for pi, ai in sorted(matched.items())]
+
     text_low = text.lower()
     hits = []
 
-    for person in people_index:
-        for known in person["names"]:
-            if known.lower() in text_low:
+    for aliases in index_cached(people_index, build_lowered_aliases):
+        for known, known_low in aliases:
+            if known_low in text_low:
                 hits.append(known)
                 break  # avoid duplicates if multiple aliases match
 
     return hits
 
-def store_document_in_db(doc_id, canonical, text, entities):
+def insert_edges(cur, edge_rows):
+    # edge_rows: (document_id, source, target) tuples
+    # Full chunks go in as one multi-row INSERT each (same SQL text, so the
+    # prepared statement is reused); the remainder uses the single-row form.
+    n = EDGE_ROWS_PER_INSERT
+    full = len(edge_rows) - len(edge_rows) % n
+    if full:
+        sql = EDGE_INSERT_SQL + ", ".join([EDGE_VALUES_ROW] * n)
+        for start in range(0, full, n):
+            cur.execute(sql, list(chain.from_iterable(edge_rows[start:start + n])))
+    cur.executemany(EDGE_INSERT_SQL + EDGE_VALUES_ROW, edge_rows[full:])
+
+def connect_db(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open the database (default CONFIG.db_path) for bulk ingest: WAL journal, fsync only at checkpoints."""
+    conn = sqlite3.connect(path or CONFIG.db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def store_document_in_db(conn, doc_id, canonical, text, entities):
+    # conn: sqlite3.Connection (see connect_db); all inserts run in one transaction
     # canonical: dict with path, sha256, size, pages, etc.
     # entities: output of extract_entities_from_text()
 
     resolved = entities["people"]["resolved"]
     unresolved = entities["people"]["unresolved_clusters"]
     orgs = entities["organizations"]
-    emails = entities["emails"]
-    urls = entities["urls"]
-
-    # Insert into documents table
-    execute_sql("""
-        INSERT OR IGNORE INTO documents (id, title, sha256, filePath, text)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        doc_id,
-        canonical["path"].split("/")[-1].replace(".pdf", ""),
-        canonical.get("sha256"),
-        canonical["path"],
-        text
-    ))
-
-    # Insert resolved people
-    for p in resolved:
-        execute_sql("""
+
+    person_ids = [p["id"] for p in resolved if p["id"]]
+
+    people_rows = [(doc_id, p["id"], p["matchedName"], p["confidence"]) for p in resolved]
+    cluster_rows = [(doc_id, json.dumps(cluster)) for cluster in unresolved]
+    org_rows = [(doc_id, o) for o in orgs]
+    edge_rows = [(doc_id, p1, p2) for p1, p2 in combinations(person_ids, 2)]
+
+    with conn:
+        cur = conn.cursor()
+
+        # Insert into documents table
+        cur.execute("""
+            INSERT OR IGNORE INTO documents (id, title, sha256, filePath, text)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            doc_id,
+            canonical["path"].split("/")[-1].replace(".pdf", ""),
+            canonical.get("sha256"),
+            canonical["path"],
+            text
+        ))
+
+        # Insert resolved people
+        cur.executemany("""
             INSERT OR IGNORE INTO document_people (document_id, person_id, matched_name, confidence)
             VALUES (?, ?, ?, ?)
-        """, (doc_id, p["id"], p["matchedName"], p["confidence"]))
+        """, people_rows)
 
-    # Insert unresolved clusters
-    for cluster in unresolved:
-        execute_sql("""
+        # Insert unresolved clusters
+        cur.executemany("""
             INSERT INTO unresolved_people (document_id, cluster)
             VALUES (?, ?)
-        """, (doc_id, json.dumps(cluster)))
+        """, cluster_rows)
 
-    # Insert orgs
-    for o in orgs:
-        execute_sql("""
+        # Insert orgs
+        cur.executemany("""
             INSERT OR IGNORE INTO document_orgs (document_id, org_name)
             VALUES (?, ?)
-        """, (doc_id, o))
+        """, org_rows)
 
-    # Insert edges
-    person_ids = [p["id"] for p in resolved if p["id"]]
-    for i, p1 in enumerate(person_ids):
-        for p2 in person_ids[i+1:]:
-            execute_sql("""
-                INSERT OR IGNORE INTO edges (document_id, source, target, relationship)
-                VALUES (?, ?, ?, 'co_mentioned')
-            """, (doc_id, p1, p2))
+        # Insert edges
+        insert_edges(cur, edge_rows)